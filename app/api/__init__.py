@@ -5,6 +5,6 @@ Este módulo separa las rutas de la lógica principal de la aplicación,
 siguiendo el principio de separación de responsabilidades.
 """
 
-from app.api.routes import router, set_user_service
+from app.api.routes import router, get_user_service
 
-__all__ = ["router", "set_user_service"]
+__all__ = ["router", "get_user_service"]
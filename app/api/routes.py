@@ -1,5 +1,8 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import ORJSONResponse
+from functools import lru_cache
 from pydantic import BaseModel, EmailStr
+from typing import List
 
 from app.models.domain import User, UserStatus
 from app.models.exception import (
@@ -9,12 +12,14 @@ from app.models.exception import (
     InvalidUserNameException,
     AppBaseException
 )
+from app.repository.sql import SQLAlchemyUserRepository
+from app.services.userService import UserService
 from app.services.logger import get_logger
 
 logger = get_logger(__name__)
 
 # Crear el router principal
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # ==================== Modelos de Request/Response ====================
@@ -57,6 +62,25 @@ class UserResponse(BaseModel):
         }
 
 
+class BulkUserCreateRequest(BaseModel):
+    """Modelo para crear varios usuarios en una sola petición."""
+    users: List[UserCreateRequest]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "users": [
+                    {
+                        "email": "usuario@ejemplo.com",
+                        "name": "Juan Pérez",
+                        "age": 25,
+                        "status": "active"
+                    }
+                ]
+            }
+        }
+
+
 class ErrorResponse(BaseModel):
     """Modelo de respuesta para errores."""
     error: str
@@ -78,23 +102,30 @@ class HealthCheckResponse(BaseModel):
     version: str
 
 
-# ==================== Dependency ====================
+# ==================== Constantes de respuesta ====================
 
-# Variable global que será inyectada desde main.py
-_user_service = None
+# Payloads fijos construidos una sola vez; los handlers de health los
+# devuelven tal cual en cada petición
+_ROOT_PAYLOAD = {
+    "message": "Alphas User Management API is running",
+    "version": "1.0.0",
+    "status": "healthy"
+}
 
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "service": "User Management API",
+    "repository": "SQLAlchemy (In-Memory)",
+    "version": "1.0.0"
+}
 
-def set_user_service(service):
-    """Configura el servicio de usuarios para ser usado en las rutas."""
-    global _user_service
-    _user_service = service
 
+# ==================== Dependency ====================
 
-def get_user_service():
-    """Obtiene la instancia del servicio de usuarios."""
-    if _user_service is None:
-        raise RuntimeError("UserService no ha sido inicializado")
-    return _user_service
+@lru_cache(maxsize=1)
+def get_user_service() -> UserService:
+    """Retorna la instancia única de UserService (creada en el primer uso)."""
+    return UserService(SQLAlchemyUserRepository())
 
 
 # ==================== Endpoints de Health ====================
@@ -108,48 +139,47 @@ def get_user_service():
 async def root():
     """Endpoint de prueba para verificar que la API está funcionando."""
     logger.info("Handling root endpoint")
-    return {
-        "message": "Alphas User Management API is running",
-        "version": "1.0.0",
-        "status": "healthy"
-    }
+    return _ROOT_PAYLOAD
 
 
 @router.get(
     "/health",
-    response_model=HealthCheckResponse,
     tags=["Health"],
     summary="Health Check",
-    description="Endpoint de verificación de salud de la API."
+    description="Endpoint de verificación de salud de la API.",
+    responses={
+        200: {"model": HealthCheckResponse, "description": "API saludable"}
+    }
 )
 async def health_check():
     """Endpoint de verificación de salud de la API."""
     logger.debug("Health check solicitado")
-    return {
-        "status": "healthy",
-        "service": "User Management API",
-        "repository": "SQLAlchemy (In-Memory)",
-        "version": "1.0.0"
-    }
+    return ORJSONResponse(_HEALTH_PAYLOAD)
 
 
 # ==================== Endpoints de Usuarios ====================
+#
+# Los endpoints de usuarios son `def` (no `async def`) a propósito: el
+# repositorio usa SQLAlchemy síncrono, y Starlette los ejecuta en su
+# threadpool sin bloquear el event loop. Si el repositorio migra a un
+# driver async, conviértelos a `async def` y usa await directamente —
+# no envuelvas las llamadas con run_in_threadpool además (doble offload).
 
 @router.post(
     "/users",
-    response_model=UserResponse,
+    response_model=None,
     status_code=status.HTTP_201_CREATED,
     tags=["Users"],
     summary="Crear usuario",
     description="Crea un nuevo usuario en el sistema.",
     responses={
-        201: {"description": "Usuario creado exitosamente"},
+        201: {"model": UserResponse, "description": "Usuario creado exitosamente"},
         400: {"description": "Datos inválidos (edad menor a 18 o nombre vacío)"},
         409: {"description": "Email duplicado"},
         500: {"description": "Error interno del servidor"}
     }
 )
-async def create_user(user_data: UserCreateRequest):
+def create_user(user_data: UserCreateRequest, user_service: UserService = Depends(get_user_service)):
     """
     Crea un nuevo usuario en el sistema.
     
@@ -167,11 +197,9 @@ async def create_user(user_data: UserCreateRequest):
         InvalidUserNameException: Si el nombre está vacío o solo contiene espacios
         DuplicateEmailException: Si el email ya existe
     """
-    logger.info(f"POST /users - Creando usuario con email: {user_data.email}")
+    logger.info("POST /users - Creando usuario con email: %s", user_data.email)
     
     try:
-        user_service = get_user_service()
-        
         # Crear usuario usando el servicio
         user = user_service.create_user(
             email=user_data.email,
@@ -180,14 +208,67 @@ async def create_user(user_data: UserCreateRequest):
             status=user_data.status
         )
         
-        logger.info(f"Usuario creado exitosamente con ID: {user.id}")
-        
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            age=user.age,
-            status=user.status.value
+        logger.info("Usuario creado exitosamente con ID: %s", user.id)
+
+        return ORJSONResponse(
+            {
+                "id": user.id,
+                "email": user.email,
+                "name": user.name,
+                "age": user.age,
+                "status": user.status
+            },
+            status_code=status.HTTP_201_CREATED
+        )
+    except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException, AppBaseException):
+        raise
+
+
+@router.post(
+    "/users/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Users"],
+    summary="Crear usuarios en lote",
+    description="Crea varios usuarios en una sola transacción.",
+    responses={
+        201: {"description": "Usuarios creados exitosamente"},
+        400: {"description": "Datos inválidos (edad menor a 18 o nombre vacío)"},
+        409: {"description": "Email duplicado"},
+        500: {"description": "Error interno del servidor"}
+    }
+)
+def create_users_bulk(bulk_data: BulkUserCreateRequest, user_service: UserService = Depends(get_user_service)):
+    """
+    Crea varios usuarios en una sola transacción.
+
+    Todo el lote se valida primero; si algún usuario es inválido no se
+    crea ninguno.
+
+    Returns:
+        list[UserResponse]: Usuarios creados con ID asignado
+    """
+    logger.info("POST /users/bulk - Creando %s usuarios", len(bulk_data.users))
+
+    try:
+        users = user_service.create_users_bulk(
+            [user.model_dump() for user in bulk_data.users]
+        )
+
+        logger.info("Lote de %s usuarios creado exitosamente", len(users))
+
+        return ORJSONResponse(
+            [
+                {
+                    "id": user.id,
+                    "email": user.email,
+                    "name": user.name,
+                    "age": user.age,
+                    "status": user.status
+                }
+                for user in users
+            ],
+            status_code=status.HTTP_201_CREATED
         )
     except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException, AppBaseException):
         raise
@@ -195,17 +276,17 @@ async def create_user(user_data: UserCreateRequest):
 
 @router.get(
     "/users/{user_id}",
-    response_model=UserResponse,
+    response_model=None,
     tags=["Users"],
     summary="Obtener usuario por ID",
     description="Obtiene un usuario específico por su ID.",
     responses={
-        200: {"description": "Usuario encontrado"},
+        200: {"model": UserResponse, "description": "Usuario encontrado"},
         404: {"description": "Usuario no encontrado"},
         500: {"description": "Error interno del servidor"}
     }
 )
-async def get_user(user_id: int):
+def get_user(user_id: int, user_service: UserService = Depends(get_user_service)):
     """
     Obtiene un usuario por su ID.
     
@@ -218,36 +299,72 @@ async def get_user(user_id: int):
     Raises:
         UserNotFoundException: Si el usuario no existe
     """
-    logger.info(f"GET /users/{user_id} - Buscando usuario")
+    logger.info("GET /users/%s - Buscando usuario", user_id)
     
     try:
-        user_service = get_user_service()
         user = user_service.get_user_by_id(user_id)
-        
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            age=user.age,
-            status=user.status.value
-        )
+
+        return ORJSONResponse({
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "age": user.age,
+            "status": user.status
+        })
+    except (UserNotFoundException, AppBaseException):
+        raise
+
+
+@router.get(
+    "/users/{user_id}/info",
+    response_model=None,
+    tags=["Users"],
+    summary="Obtener información de usuario",
+    description="Obtiene la información de un usuario como JSON preserializado.",
+    responses={
+        200: {"model": UserResponse, "description": "Usuario encontrado"},
+        404: {"description": "Usuario no encontrado"},
+        500: {"description": "Error interno del servidor"}
+    }
+)
+def get_user_info(user_id: int, user_service: UserService = Depends(get_user_service)):
+    """
+    Obtiene la información de un usuario.
+
+    El servicio entrega el documento JSON ya serializado; devolverlo en
+    un Response crudo evita que el framework lo vuelva a serializar.
+
+    Args:
+        user_id: ID del usuario a buscar
+
+    Returns:
+        UserResponse: Información del usuario
+
+    Raises:
+        UserNotFoundException: Si el usuario no existe
+    """
+    logger.info("GET /users/%s/info - Obteniendo información", user_id)
+
+    try:
+        payload = user_service.get_user_info(user_id)
+        return Response(content=payload, media_type="application/json")
     except (UserNotFoundException, AppBaseException):
         raise
 
 
 @router.get(
     "/users/email/{email}",
-    response_model=UserResponse,
+    response_model=None,
     tags=["Users"],
     summary="Obtener usuario por email",
     description="Obtiene un usuario específico por su email.",
     responses={
-        200: {"description": "Usuario encontrado"},
+        200: {"model": UserResponse, "description": "Usuario encontrado"},
         404: {"description": "Usuario no encontrado"},
         500: {"description": "Error interno del servidor"}
     }
 )
-async def get_user_by_email(email: str):
+def get_user_by_email(email: str, user_service: UserService = Depends(get_user_service)):
     """
     Obtiene un usuario por su email.
     
@@ -260,35 +377,34 @@ async def get_user_by_email(email: str):
     Raises:
         UserNotFoundException: Si el usuario no existe
     """
-    logger.info(f"GET /users/email/{email} - Buscando usuario por email")
+    logger.info("GET /users/email/%s - Buscando usuario por email", email)
     
     try:
-        user_service = get_user_service()
         user_dict = user_service.get_user_by_email(email)
-        
-        return UserResponse(
-            id=user_dict["id"],
-            email=user_dict["email"],
-            name=user_dict["name"],
-            age=user_dict["age"],
-            status=user_dict["status"]
-        )
+
+        return ORJSONResponse({
+            "id": user_dict["id"],
+            "email": user_dict["email"],
+            "name": user_dict["name"],
+            "age": user_dict["age"],
+            "status": user_dict["status"]
+        })
     except (UserNotFoundException, AppBaseException):
         raise
 
 
 @router.get(
     "/users/check-email/{email}",
-    response_model=EmailCheckResponse,
+    response_model=None,
     tags=["Users"],
     summary="Verificar disponibilidad de email",
     description="Verifica si un email ya existe en el sistema.",
     responses={
-        200: {"description": "Verificación exitosa"},
+        200: {"model": EmailCheckResponse, "description": "Verificación exitosa"},
         500: {"description": "Error interno del servidor"}
     }
 )
-async def check_email_exists(email: str):
+def check_email_exists(email: str, user_service: UserService = Depends(get_user_service)):
     """
     Verifica si un email ya existe en el sistema.
     
@@ -298,17 +414,16 @@ async def check_email_exists(email: str):
     Returns:
         EmailCheckResponse: Estado de existencia y disponibilidad del email
     """
-    logger.info(f"GET /users/check-email/{email} - Verificando existencia de email")
+    logger.info("GET /users/check-email/%s - Verificando existencia de email", email)
     
     try:
-        user_service = get_user_service()
         exists = user_service.email_exists(email)
-        
-        return EmailCheckResponse(
-            email=email,
-            exists=exists,
-            available=not exists
-        )
+
+        return ORJSONResponse({
+            "email": email,
+            "exists": exists,
+            "available": not exists
+        })
     except AppBaseException:
         raise
 
@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -22,6 +24,13 @@ class Settings(BaseSettings):
     
     # Configuración de edad mínima
     MIN_USER_AGE: int = 18
+
+    # Configuración de caché de lecturas
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Hilos del pool donde corren los endpoints síncronos (consultas DB)
+    THREADPOOL_MAX_THREADS: int = 64
     
     # Configuración del servidor
     HOST: str = "0.0.0.0"
@@ -34,11 +43,19 @@ class Settings(BaseSettings):
     ALLOW_METHODS: list = ["*"]
     ALLOW_HEADERS: list = ["*"]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Retorna la configuración, parseando .env una sola vez por proceso."""
+    return Settings()
 
 
 # Instancia global de configuración
-settings = Settings()
+settings = get_settings()
 
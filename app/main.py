@@ -1,5 +1,7 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import logging
 import time
 
 from app.models.exception import (
@@ -9,10 +11,9 @@ from app.models.exception import (
     InvalidUserNameException,
     AppBaseException
 )
-from app.repository.sql import SQLAlchemyUserRepository
-from app.services.userService import UserService
+from app.core.config import settings
 from app.services.logger import app_logger, log_request_response
-from app.api.routes import router, set_user_service
+from app.api.routes import router
 
 # Logger configurado desde el módulo centralizado
 logger = app_logger
@@ -23,17 +24,14 @@ app = FastAPI(
     description="API para gestión de usuarios con patrón Repository",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# Inicializar Repository y Service (Dependency Injection manual)
-user_repository = SQLAlchemyUserRepository()
-user_service = UserService(user_repository)
+# Comprimir respuestas JSON que superen el tamaño mínimo
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
-# Configurar el servicio en las rutas
-set_user_service(user_service)
-
-# Incluir las rutas de la API
+# Incluir las rutas de la API (el UserService se inyecta vía Depends)
 app.include_router(router)
 
 
@@ -42,18 +40,19 @@ app.include_router(router)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Middleware para logging de todas las peticiones HTTP."""
-    logger.debug(f"Inbound request: {request.method} {request.url} (headers={dict(request.headers)})")
-    start_time = time.time()
-    logger.debug("Calling next(request) to proceed with request.")
+    # Evitar materializar dict(request.headers) si DEBUG está apagado
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Inbound request: %s %s (headers=%s)", request.method, request.url, dict(request.headers))
+    # perf_counter: reloj monotónico, más barato y preciso que time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    logger.debug("Returned from next(request), preparing to send response.")
-    process_time = (time.time() - start_time) * 1000
+    process_time = (time.perf_counter() - start_time) * 1000
     
     # Usar función centralizada de logging
     log_request_response(
         logger=logger,
         method=request.method,
-        url=str(request.url.path),
+        url=request.url.path,
         status_code=response.status_code,
         duration_ms=process_time
     )
@@ -66,50 +65,66 @@ async def log_requests(request: Request, call_next):
 @app.exception_handler(UserNotFoundException)
 async def user_not_found_exception_handler(request: Request, exc: UserNotFoundException):
     """Maneja excepciones de usuario no encontrado."""
-    logger.error(f"UserNotFoundException: {exc.message}")
-    return JSONResponse(
+    logger.error("UserNotFoundException: %s", exc.message)
+    return ORJSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
-        content={"error": "Usuario no encontrado", "detail": exc.message}
+        content={"error": exc.ERROR_LABEL, "detail": exc.message}
     )
 
 
 @app.exception_handler(DuplicateEmailException)
 async def duplicate_email_exception_handler(request: Request, exc: DuplicateEmailException):
     """Maneja excepciones de email duplicado."""
-    logger.error(f"DuplicateEmailException: {exc.message}")
-    return JSONResponse(
+    logger.error("DuplicateEmailException: %s", exc.message)
+    return ORJSONResponse(
         status_code=status.HTTP_409_CONFLICT,
-        content={"error": "Email duplicado", "detail": exc.message}
+        content={"error": exc.ERROR_LABEL, "detail": exc.message}
     )
 
 
 @app.exception_handler(InvalidAgeException)
 async def invalid_age_exception_handler(request: Request, exc: InvalidAgeException):
     """Maneja excepciones de edad inválida."""
-    logger.error(f"InvalidAgeException: {exc.message}")
-    return JSONResponse(
+    logger.error("InvalidAgeException: %s", exc.message)
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
-        content={"error": "Edad inválida", "detail": exc.message}
+        content={"error": exc.ERROR_LABEL, "detail": exc.message}
     )
 
 
 @app.exception_handler(InvalidUserNameException)
 async def invalid_username_exception_handler(request: Request, exc: InvalidUserNameException):
     """Maneja excepciones de nombre de usuario inválido."""
-    logger.error(f"InvalidUserNameException: {exc.message}")
-    return JSONResponse(
+    logger.error("InvalidUserNameException: %s", exc.message)
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
-        content={"error": "Nombre de usuario inválido", "detail": exc.message}
+        content={"error": exc.ERROR_LABEL, "detail": exc.message}
     )
 
 
 @app.exception_handler(AppBaseException)
 async def app_base_exception_handler(request: Request, exc: AppBaseException):
     """Maneja excepciones genéricas de la aplicación."""
-    logger.error(f"AppBaseException: {exc.message}")
-    return JSONResponse(
+    logger.error("AppBaseException: %s", exc.message)
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"error": exc.ERROR_LABEL, "detail": exc.message}
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Convierte cualquier excepción no controlada en un 500 uniforme.
+
+    El servicio ya no envuelve cada método en un except Exception
+    genérico; este handler central cumple ese rol una sola vez, con el
+    traceback original intacto en el log.
+    """
+    logger.exception("Excepción no controlada en %s %s", request.method, request.url.path)
+    wrapped = AppBaseException(str(exc))
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"error": "Error en la aplicación", "detail": exc.message}
+        content={"error": wrapped.ERROR_LABEL, "detail": wrapped.message}
     )
 
 
@@ -118,6 +133,12 @@ async def app_base_exception_handler(request: Request, exc: AppBaseException):
 @app.on_event("startup")
 async def startup_event():
     """Evento de inicio de la aplicación."""
+    # Los endpoints de usuarios son `def` y corren en el threadpool de
+    # anyio (40 hilos por defecto): ampliarlo sube el número de consultas
+    # de base de datos que pueden estar en vuelo a la vez
+    import anyio.to_thread
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.THREADPOOL_MAX_THREADS
     logger.info("="*60)
     logger.info("Iniciando Alphas User Management API v1.0.0")
     logger.info("="*60)
@@ -1,23 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-from app.models.domain import User
+from typing import List, Optional
+from app.models.domain import User, UserStatus
 
 
 class UserRepository(ABC):
     """Interfaz abstracta para el repositorio de usuarios."""
-    
+
     @abstractmethod
     def save(self, user: User) -> User:
         """Guarda usuario y retorna con ID asignado"""
         pass
+
+    @abstractmethod
+    def save_many(self, users: List[User]) -> List[User]:
+        """Guarda varios usuarios en una sola transacción y retorna con IDs"""
+        pass
     
     @abstractmethod
     def find_by_id(self, user_id: int) -> Optional[User]:
         """Busca usuario por ID"""
         pass
+
+    @abstractmethod
+    def find_by_id_as_dict(self, user_id: int) -> dict:
+        """Busca usuario por ID y retorna la fila como diccionario"""
+        pass
+
+    @abstractmethod
+    def find_by_ids(self, user_ids: List[int]) -> List[dict]:
+        """Busca varios usuarios por ID en una sola consulta"""
+        pass
     
     @abstractmethod
-    def get_user_by_email(self, email: str) -> Optional[dict]:
-        """Busca usuario por email"""
+    def update_status(self, user_id: int, status: UserStatus) -> Optional[User]:
+        """Actualiza el estado de un usuario y retorna la fila actualizada, o None si no existe"""
+        pass
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> dict:
+        """Busca usuario por email; lanza UserNotFoundException si no existe"""
         pass
 
@@ -1,16 +1,28 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from enum import Enum
 
 
-class UserStatus(Enum):
-    """Estados posibles de un usuario."""
+class UserStatus(str, Enum):
+    """Estados posibles de un usuario.
+
+    Hereda de str para que los miembros se serialicen como cadenas
+    planas sin pasar por .value.
+    """
     ACTIVE = "active"
     INACTIVE = "inactive"
 
 
 class User(BaseModel):
-    """Modelo de dominio para representar un usuario."""
+    """Modelo de dominio para representar un usuario.
+
+    Inmutable tras su construcción (frozen): las instancias se comparten
+    entre las cachés de lectura y los llamadores sin riesgo de que una
+    mutación en un sitio se filtre al resto. Las actualizaciones crean
+    una instancia nueva con model_copy(update=...).
+    """
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[int] = None
     email: EmailStr
     name: str
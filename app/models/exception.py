@@ -1,5 +1,12 @@
 class AppBaseException(Exception):
-    """Clase base para excepciones personalizadas de la aplicación."""
+    """Clase base para excepciones personalizadas de la aplicación.
+
+    La clase base es la única que antepone el prefijo "Alphas Error: ";
+    las subclases pasan su mensaje sin prefijar. ERROR_LABEL es la
+    etiqueta fija que los handlers HTTP usan en el campo "error".
+    """
+    ERROR_LABEL = "Error en la aplicación"
+
     def __init__(self, message=None):
         base_message = "Alphas Error: "
         if message:
@@ -10,26 +17,28 @@ class AppBaseException(Exception):
 
 class UserNotFoundException(AppBaseException):
     """Se lanza cuando un usuario no es encontrado."""
+    ERROR_LABEL = "Usuario no encontrado"
+
     def __init__(self, message="Usuario no encontrado"):
-        alpha_message = f"Alphas Error: {message}"
-        super().__init__(alpha_message)
+        super().__init__(message)
 
 class DuplicateEmailException(AppBaseException):
     """Se lanza cuando un email de usuario ya existe."""
+    ERROR_LABEL = "Email duplicado"
+
     def __init__(self, message="El email ya existe en la base de datos"):
-        alpha_message = f"Alphas Error: {message}"
-        super().__init__(alpha_message)
+        super().__init__(message)
 
 class InvalidAgeException(AppBaseException):
     """Se lanza cuando la edad del usuario no es válida."""
+    ERROR_LABEL = "Edad inválida"
+
     def __init__(self, message="La edad del usuario no es válida"):
-        alpha_message = f"Alphas Error: {message}"
-        super().__init__(alpha_message)
+        super().__init__(message)
 
 class InvalidUserNameException(AppBaseException):
     """Se lanza cuando el nombre de usuario es inválido."""
-    def __init__(self, message="El nombre de usuario no puede estar vacío o solo contener espacios"):
-        alpha_message = f"Alphas Error: {message}"
-        super().__init__(alpha_message)
-
+    ERROR_LABEL = "Nombre de usuario inválido"
 
+    def __init__(self, message="El nombre de usuario no puede estar vacío o solo contener espacios"):
+        super().__init__(message)
@@ -1,4 +1,9 @@
-from sqlalchemy import create_engine, Table, Column, Integer, String, MetaData, func
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, Table, Column, Enum, Integer, String, MetaData, select, exists, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
 from typing import Optional
 
 from app.models.domain import User, UserStatus
@@ -9,10 +14,18 @@ from app.models.exception import (
     InvalidAgeException, 
     InvalidUserNameException
 )
+from app.core.config import settings
 from app.services.logger import get_logger, log_exception
 
 logger = get_logger(__name__)
 
+# Edad mínima resuelta una vez a nivel de módulo (viene de Settings)
+MIN_AGE = settings.MIN_USER_AGE
+
+# Cota de la caché de lecturas del repositorio (comparte el knob de la
+# caché de servicio)
+CACHE_MAX = settings.CACHE_MAX_ENTRIES
+
 
 class SQLAlchemyUserRepository(UserRepository):
     def __init__(self):
@@ -20,7 +33,14 @@ class SQLAlchemyUserRepository(UserRepository):
         logger.info("Inicializando SQLAlchemyUserRepository")
         
         # Motor en memoria - SOLO SIMULACIÓN
-        self.engine = create_engine('sqlite:///:memory:', echo=False)
+        # Los endpoints sync corren en el threadpool de Starlette, así que
+        # la conexión debe poder usarse desde cualquier hilo
+        self.engine = create_engine(
+            'sqlite:///:memory:',
+            echo=False,
+            connect_args={'check_same_thread': False},
+            poolclass=StaticPool
+        )
         self.metadata = MetaData()
         
         # Definir tabla usuarios
@@ -28,139 +48,459 @@ class SQLAlchemyUserRepository(UserRepository):
             Column('id', Integer, primary_key=True, autoincrement=True),
             Column('email', String(100), unique=True, nullable=False),
             Column('name', String(50), nullable=False),
-            Column('status', String(20), nullable=False),
+            Column('status', Enum(UserStatus, native_enum=False, length=20, values_callable=lambda e: [m.value for m in e]), nullable=False),
             Column('age', Integer, nullable=False)
         )
         
         # Crear tablas
         self.metadata.create_all(self.engine)
         self.connection = self.engine.connect()
-        
+
+        # Con StaticPool todos los hilos del threadpool comparten esta
+        # única conexión: el lock serializa cada operación de BD para
+        # que un COMMIT no arrastre escrituras a medias de otro hilo y
+        # el check-then-insert de save() sea atómico. Reentrante porque
+        # save() llama a email_exists() ya con el lock tomado.
+        self._db_lock = threading.RLock()
+
+        # Caché de lecturas en proceso, acotada con desalojo LRU: el
+        # orden de inserción del dict hace de cola (los hits reinsertan
+        # al final vía _touch_cached). Sin cota retendría una segunda
+        # copia completa de la tabla durante toda la vida del proceso.
+        self._by_id: dict = {}
+        self._by_email: dict = {}
+        self._cache_lock = threading.Lock()
+
+        # Sentencias construidas una sola vez; los parámetros se ligan
+        # en cada execute, evitando recompilar el statement por petición
+        self._stmt_by_id = self.users.select().where(self.users.c.id == bindparam('id'))
+        self._stmt_by_email = self.users.select().where(self.users.c.email == bindparam('email'))
+        self._stmt_exists = select(exists().where(self.users.c.email == bindparam('email')))
+        self._stmt_insert = self.users.insert()
+        self._stmt_insert_returning = self.users.insert().returning(self.users.c.id)
+        self._stmt_update_status = (
+            self.users.update()
+            .where(self.users.c.id == bindparam('uid'))
+            .values(status=bindparam('new_status'))
+            .returning(*self.users.c)
+        )
+
+        # Estado de batch POR HILO: un transaction() abierto en un hilo
+        # no debe hacer que los save() de otros hilos omitan su COMMIT
+        # y se cuelen en un batch ajeno
+        self._batch_state = threading.local()
+
         logger.info("SQLAlchemyUserRepository inicializado correctamente")
 
+    @property
+    def _in_batch(self) -> bool:
+        """True si el hilo actual tiene un transaction() abierto."""
+        return getattr(self._batch_state, 'active', False)
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa varias escrituras en un único par BEGIN/COMMIT.
+
+        Dentro del bloque, save() y save_many() no confirman por su
+        cuenta; el COMMIT (o ROLLBACK si algo falla) se emite una sola
+        vez al salir. Los bloques anidados (mismo hilo) se unen al batch
+        exterior. El lock de BD se retiene durante todo el batch, de
+        modo que ningún otro hilo puede intercalar escrituras ni ver el
+        estado a medio confirmar.
+        """
+        if self._in_batch:
+            yield self.connection
+            return
+        with self._db_lock:
+            self._batch_state.active = True
+            try:
+                yield self.connection
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                self._batch_state.active = False
+
+    def _commit(self) -> None:
+        """Confirma la transacción, salvo que haya un batch abierto."""
+        if not self._in_batch:
+            self.connection.commit()
+
+    def _cache_user(self, user: User) -> None:
+        """Registra un usuario en la caché de lecturas.
+
+        Si la caché está llena, desaloja los usuarios menos usados
+        recientemente (cabeza de la cola de inserción) antes de insertar.
+        """
+        with self._cache_lock:
+            old = self._by_id.pop(user.id, None)
+            if old is not None:
+                self._by_email.pop(old.email, None)
+            while len(self._by_id) >= CACHE_MAX:
+                evicted = self._by_id.pop(next(iter(self._by_id)))
+                self._by_email.pop(evicted.email, None)
+            self._by_id[user.id] = user
+            self._by_email[user.email] = user
+
+    def _touch_cached(self, user_id: int) -> None:
+        """Reinserta una entrada al final de la cola LRU tras un hit."""
+        with self._cache_lock:
+            user = self._by_id.pop(user_id, None)
+            if user is not None:
+                self._by_id[user_id] = user
+
+    def _invalidate(self, user_id: int) -> None:
+        """Expulsa un usuario de la caché (para futuros update/delete)."""
+        with self._cache_lock:
+            user = self._by_id.pop(user_id, None)
+            if user is not None:
+                self._by_email.pop(user.email, None)
+
+    @staticmethod
+    def _row_to_user(row) -> User:
+        """Reconstruye un User desde una fila ya validada de la base de datos.
+
+        Recibe un RowMapping (acceso por nombre de columna) y usa
+        model_construct para saltarse la validación de pydantic (incluida
+        la regex de EmailStr): los datos ya fueron validados al insertarse.
+        """
+        return User.model_construct(
+            id=row['id'],
+            email=row['email'],
+            name=row['name'],
+            status=row['status'],
+            age=row['age']
+        )
+
     def save(self, user: User) -> User:
         """Guarda un nuevo usuario en la base de datos."""
-        try:
-            logger.debug(f"Intentando guardar usuario con email: {user.email}")
-            
-            # Validar edad
-            if user.age < 18:
-                logger.warning(f"Edad inválida: {user.age}")
-                raise InvalidAgeException("La edad debe ser mayor o igual a 18 años")
+        logger.debug("Intentando guardar usuario con email: %s", user.email)
+
+        # Validar edad
+        if user.age < MIN_AGE:
+            logger.warning("Edad inválida: %s", user.age)
+            raise InvalidAgeException("La edad debe ser mayor o igual a 18 años")
+
+        # Validar nombre no nulo ni vacío o sólo espacios
+        if not user.name or not user.name.strip():
+            logger.warning("Nombre de usuario inválido")
+            raise InvalidUserNameException("El nombre no puede estar vacío o en blanco")
+
+        # El lock cubre desde el chequeo de duplicado hasta el COMMIT:
+        # sin él, dos hilos pueden pasar el chequeo con el mismo email
+        with self._db_lock:
+            try:
+                # Validar email duplicado
+                if self.email_exists(user.email):
+                    logger.warning("Email duplicado: %s", user.email)
+                    raise DuplicateEmailException("El email ya existe en la base de datos")
+
+                # Preparar datos para INSERT
+                values = {
+                    'email': user.email,
+                    'name': user.name,
+                    'status': user.status,
+                    'age': user.age
+                }
+
+                # Ejecutar INSERT
+                result = self.connection.execute(self._stmt_insert, values)
+                self._commit()
+
+                # User es frozen: la versión con ID es una copia nueva
+                new_id = result.inserted_primary_key[0] if result.inserted_primary_key else None
+                saved = user.model_copy(update={'id': new_id})
+
+                if saved.id is not None:
+                    self._cache_user(saved)
+
+                logger.info("Usuario guardado exitosamente con ID: %s", saved.id)
+                return saved
 
-            # Validar nombre no nulo ni vacío o sólo espacios
+            except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException):
+                raise
+            except IntegrityError:
+                # La constraint única de email saltó en el INSERT: mismo
+                # significado de negocio que el chequeo previo, sin
+                # filtrar el SQL del error original al cliente
+                self.connection.rollback()
+                logger.warning("Email duplicado (constraint única): %s", user.email)
+                raise DuplicateEmailException("El email ya existe en la base de datos")
+            except Exception as e:
+                self.connection.rollback()
+                logger.error("Error inesperado al guardar usuario: %s", e)
+                log_exception(logger, e, "save")
+                raise UserNotFoundException("Error al guardar usuario")
+
+    def email_exists_many(self, emails: list) -> set:
+        """Retorna el subconjunto de emails que ya existen en la base de datos.
+
+        Un único SELECT ... IN (...) en lugar de un email_exists por email.
+        """
+        stmt = select(self.users.c.email).where(self.users.c.email.in_(emails))
+        with self._db_lock:
+            return {row[0] for row in self.connection.execute(stmt)}
+
+    def save_many(self, users: list) -> list:
+        """Guarda varios usuarios en una única transacción.
+
+        Valida todo el lote en Python, verifica los duplicados contra la
+        base de datos con un solo SELECT y ejecuta un único INSERT con
+        todas las filas, en lugar de tres round-trips por usuario.
+        """
+        logger.debug("Intentando guardar lote de %s usuarios", len(users))
+
+        # Lote vacío: nada que validar ni insertar. Sin este corte, el
+        # INSERT multi-fila se renderiza como DEFAULT VALUES y revienta
+        # contra el NOT NULL de email
+        if not users:
+            return []
+
+        # Validar todo el lote antes de tocar la base de datos
+        for user in users:
+            if user.age < MIN_AGE:
+                logger.warning("Edad inválida en lote: %s", user.age)
+                raise InvalidAgeException("La edad debe ser mayor o igual a 18 años")
             if not user.name or not user.name.strip():
-                logger.warning("Nombre de usuario inválido")
+                logger.warning("Nombre de usuario inválido en lote")
                 raise InvalidUserNameException("El nombre no puede estar vacío o en blanco")
-            
-            # Validar email duplicado
-            if self.email_exists(user.email):
-                logger.warning(f"Email duplicado: {user.email}")
-                raise DuplicateEmailException("El email ya existe en la base de datos")
 
-            # Preparar datos para INSERT
-            values = {
-                'email': user.email,
-                'name': user.name,
-                'status': user.status.value,
-                'age': user.age
-            }
+        # Duplicados dentro del propio lote
+        emails = [user.email for user in users]
+        if len(set(emails)) != len(emails):
+            raise DuplicateEmailException("El lote contiene emails repetidos")
 
-            # Ejecutar INSERT
-            result = self.connection.execute(self.users.insert(), values)
-            self.connection.commit()
-            
-            # Asignar ID autoincremental
-            user.id = result.inserted_primary_key[0] if result.inserted_primary_key else None
-            
-            logger.info(f"Usuario guardado exitosamente con ID: {user.id}")
-            return user
-            
-        except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException):
-            raise
-        except Exception as e:
-            logger.error(f"Error inesperado al guardar usuario: {str(e)}")
-            log_exception(logger, e, "save")
-            raise UserNotFoundException(f"Error al guardar usuario: {str(e)}")
+        # Chequeo de duplicados + INSERT + COMMIT bajo el mismo lock
+        # para que ningún otro hilo se cuele entre medias
+        with self._db_lock:
+            try:
+                # Duplicados contra la BD con un único SELECT ... IN (...)
+                existing = self.email_exists_many(emails)
+                if existing:
+                    logger.warning("Emails duplicados en lote: %s", existing)
+                    raise DuplicateEmailException("El email ya existe en la base de datos")
+
+                values = [
+                    {
+                        'email': user.email,
+                        'name': user.name,
+                        'status': user.status,
+                        'age': user.age
+                    }
+                    for user in users
+                ]
+
+                # Un único INSERT multi-fila (con RETURNING para recuperar
+                # los IDs) + un único COMMIT
+                result = self.connection.execute(self._stmt_insert_returning, values)
+                inserted_ids = result.scalars().all()
+                self._commit()
+
+                saved_users = []
+                for user, user_id in zip(users, inserted_ids):
+                    saved = user.model_copy(update={'id': user_id})
+                    if saved.id is not None:
+                        self._cache_user(saved)
+                    saved_users.append(saved)
+
+                logger.info("Lote de %s usuarios guardado exitosamente", len(saved_users))
+                return saved_users
+
+            except DuplicateEmailException:
+                raise
+            except IntegrityError:
+                self.connection.rollback()
+                logger.warning("Emails duplicados en lote (constraint única)")
+                raise DuplicateEmailException("El email ya existe en la base de datos")
+            except Exception as e:
+                self.connection.rollback()
+                logger.error("Error inesperado al guardar lote de usuarios: %s", e)
+                log_exception(logger, e, "save_many")
+                raise UserNotFoundException("Error al guardar usuarios")
 
     def find_by_id(self, user_id: int) -> Optional[User]:
         """Busca un usuario por su ID."""
-        try:
-            logger.debug(f"Buscando usuario con ID: {user_id}")
-            
-            # Ejecutar SELECT
-            stmt = self.users.select().where(self.users.c.id == user_id)
-            result = self.connection.execute(stmt)
-            user_data = result.fetchone()
-            
-            # Si existe, convertir a User object
-            if user_data:
-                user = User(
-                    id=user_data[0],
-                    email=user_data[1],
-                    name=user_data[2],
-                    status=UserStatus(user_data[3]),
-                    age=user_data[4]
-                )
-                logger.debug(f"Usuario encontrado: {user.email}")
+        logger.debug("Buscando usuario con ID: %s", user_id)
+
+        # Consultar primero la caché en proceso (sin tomar el lock de BD)
+        cached = self._by_id.get(user_id)
+        if cached is not None:
+            self._touch_cached(user_id)
+            logger.debug("Usuario %s servido desde caché", user_id)
+            return cached
+
+        with self._db_lock:
+            try:
+                # Ejecutar SELECT (fila con acceso por nombre de columna)
+                user_data = self.connection.execute(self._stmt_by_id, {'id': user_id}).mappings().first()
+
+                # Si existe, convertir a User object
+                if user_data:
+                    user = self._row_to_user(user_data)
+                    self._cache_user(user)
+                    logger.debug("Usuario encontrado: %s", user.email)
+                    return user
+
+                # Si no existe, lanzar excepción
+                logger.warning("Usuario con ID %s no encontrado", user_id)
+                raise UserNotFoundException(f"Usuario con ID '{user_id}' no encontrado")
+
+            except UserNotFoundException:
+                raise
+            except Exception as e:
+                logger.error("Error al buscar usuario por ID: %s", e)
+                log_exception(logger, e, "find_by_id")
+                raise UserNotFoundException("Error al buscar usuario")
+
+    def find_by_id_as_dict(self, user_id: int) -> dict:
+        """Busca un usuario por su ID y retorna la fila como diccionario.
+
+        Evita materializar un User intermedio cuando el llamador sólo
+        quiere un dict (p. ej. get_user_info).
+        """
+        logger.debug("Buscando usuario (dict) con ID: %s", user_id)
+
+        cached = self._by_id.get(user_id)
+        if cached is not None:
+            self._touch_cached(user_id)
+            return {
+                'id': cached.id,
+                'email': cached.email,
+                'name': cached.name,
+                'age': cached.age,
+                'status': cached.status.value
+            }
+
+        with self._db_lock:
+            try:
+                row = self.connection.execute(self._stmt_by_id, {'id': user_id}).mappings().first()
+
+                if row:
+                    self._cache_user(self._row_to_user(row))
+                    user_dict = dict(row)
+                    user_dict['status'] = user_dict['status'].value
+                    return user_dict
+
+                logger.warning("Usuario con ID %s no encontrado", user_id)
+                raise UserNotFoundException(f"Usuario con ID '{user_id}' no encontrado")
+
+            except UserNotFoundException:
+                raise
+            except Exception as e:
+                logger.error("Error al buscar usuario por ID: %s", e)
+                log_exception(logger, e, "find_by_id_as_dict")
+                raise UserNotFoundException("Error al buscar usuario")
+
+    def update_status(self, user_id: int, status: UserStatus) -> Optional[User]:
+        """Actualiza el estado de un usuario en un solo round-trip.
+
+        UPDATE ... RETURNING devuelve la fila ya actualizada, así que no
+        hace falta un SELECT previo (ni hay ventana entre leer y escribir).
+        Retorna None si el ID no existe.
+        """
+        logger.debug("Actualizando estado del usuario %s a %s", user_id, status.value)
+
+        with self._db_lock:
+            try:
+                row = self.connection.execute(
+                    self._stmt_update_status,
+                    {'uid': user_id, 'new_status': status}
+                ).mappings().first()
+                self._commit()
+
+                if row is None:
+                    logger.warning("Usuario con ID %s no encontrado", user_id)
+                    return None
+
+                # La fila cacheada quedó vieja: reemplazarla por la actualizada
+                self._invalidate(user_id)
+                user = self._row_to_user(row)
+                self._cache_user(user)
+
+                logger.info("Estado del usuario %s actualizado a %s", user_id, status.value)
                 return user
-            
-            # Si no existe, lanzar excepción
-            logger.warning(f"Usuario con ID {user_id} no encontrado")
-            raise UserNotFoundException(f"Usuario con ID '{user_id}' no encontrado")
-            
-        except UserNotFoundException:
-            raise
+
+            except Exception as e:
+                self.connection.rollback()
+                logger.error("Error al actualizar estado del usuario: %s", e)
+                log_exception(logger, e, "update_status")
+                raise UserNotFoundException("Error al actualizar usuario")
+
+    def find_by_ids(self, user_ids: list) -> list:
+        """Busca varios usuarios con un único SELECT ... WHERE id IN (...).
+
+        Retorna las filas como mappings, sin materializar objetos User:
+        el llamador típico (export masivo) sólo necesita los valores.
+        Los IDs inexistentes simplemente no aparecen en el resultado.
+        """
+        try:
+            logger.debug("Buscando %s usuarios por ID", len(user_ids))
+            stmt = select(self.users).where(self.users.c.id.in_(user_ids))
+            with self._db_lock:
+                return list(self.connection.execute(stmt).mappings())
         except Exception as e:
-            logger.error(f"Error al buscar usuario por ID: {str(e)}")
-            log_exception(logger, e, "find_by_id")
-            raise UserNotFoundException(f"Error al buscar usuario: {str(e)}")
+            logger.error("Error al buscar usuarios por IDs: %s", e)
+            log_exception(logger, e, "find_by_ids")
+            raise UserNotFoundException("Error al buscar usuarios")
 
     def email_exists(self, email: str) -> bool:
         """Verifica si un email ya existe en la base de datos."""
         try:
-            logger.debug(f"Verificando existencia de email: {email}")
-            
-            # Ejecutar SELECT COUNT(*)
-            stmt = self.users.select().with_only_columns(func.count()).where(self.users.c.email == email)
-            result = self.connection.execute(stmt)
-            count = result.scalar()
-            
-            exists = count > 0
-            logger.debug(f"Email {email} existe: {exists}")
-            return exists
-            
+            logger.debug("Verificando existencia de email: %s", email)
+
+            # SELECT EXISTS(...) corta en la primera coincidencia y usa
+            # el índice único de la columna email
+            with self._db_lock:
+                result = self.connection.execute(self._stmt_exists, {'email': email})
+                email_found = bool(result.scalar())
+
+            logger.debug("Email %s existe: %s", email, email_found)
+            return email_found
+
         except Exception as e:
-            logger.error(f"Error al verificar email: {str(e)}")
+            logger.error("Error al verificar email: %s", e)
             log_exception(logger, e, "email_exists")
-            raise UserNotFoundException(f"Error al verificar email: {str(e)}")
+            raise UserNotFoundException("Error al verificar email")
 
-    def get_user_by_email(self, email: str) -> Optional[dict]:
-        """Busca un usuario por su email y retorna un diccionario."""
-        try:
-            logger.debug(f"Buscando usuario con email: {email}")
-            
-            result = self.connection.execute(self.users.select().where(self.users.c.email == email))
-            user_data = result.fetchone()
-            
-            if user_data:
-                user = User(
-                    id=user_data[0],
-                    email=user_data[1],
-                    name=user_data[2],
-                    status=UserStatus(user_data[3]),
-                    age=user_data[4]
-                )
-                logger.debug(f"Usuario encontrado: {user.email}")
-                return user.dict()
-            else:
-                logger.warning(f"Usuario con email {email} no encontrado")
+    def get_user_by_email(self, email: str) -> dict:
+        """Busca un usuario por su email y retorna un diccionario.
+
+        Lanza UserNotFoundException si el email no existe, igual que
+        find_by_id: sin dicts centinela {'error': ...} que el llamador
+        tenga que inspeccionar.
+        """
+        logger.debug("Buscando usuario con email: %s", email)
+
+        # Consultar primero la caché en proceso (sin tomar el lock de BD)
+        cached = self._by_email.get(email)
+        if cached is not None:
+            self._touch_cached(cached.id)
+            logger.debug("Usuario con email %s servido desde caché", email)
+            return {
+                'id': cached.id,
+                'email': cached.email,
+                'name': cached.name,
+                'status': cached.status,
+                'age': cached.age
+            }
+
+        with self._db_lock:
+            try:
+                user_data = self.connection.execute(self._stmt_by_email, {'email': email}).mappings().first()
+
+                if user_data:
+                    self._cache_user(self._row_to_user(user_data))
+                    logger.debug("Usuario encontrado: %s", user_data['email'])
+                    # La fila ya es un mapping 1:1 con las columnas de la
+                    # tabla; devolverla como dict evita reconstruirla a mano
+                    return dict(user_data)
+                logger.warning("Usuario con email %s no encontrado", email)
                 raise UserNotFoundException(f"Usuario con email '{email}' no existe")
-                
-        except (UserNotFoundException, DuplicateEmailException, InvalidAgeException, InvalidUserNameException) as e:
-            logger.error(f"Error de validación: {str(e)}")
-            return {'error': str(e)}
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar usuario por email: {str(e)}")
-            log_exception(logger, e, "get_user_by_email")
-            return {'error': f"Error inesperado: {str(e)}"}
+
+            except UserNotFoundException:
+                raise
+            except Exception as e:
+                logger.error("Error inesperado al buscar usuario por email: %s", e)
+                log_exception(logger, e, "get_user_by_email")
+                raise UserNotFoundException("Error al buscar usuario")
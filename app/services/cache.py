@@ -0,0 +1,126 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TTLCache:
+    """
+    Caché en memoria con expiración por clave y tamaño acotado.
+
+    Hace de equivalente en proceso de un Redis de lectura (GET/SETEX/DEL):
+    la API es la misma que usaría un cliente externo, así que sustituirla
+    por Redis más adelante no cambia a los llamadores.
+
+    El tamaño está acotado (maxsize) con desalojo LRU: las claves derivan
+    en parte de entrada del cliente (IDs y emails arbitrarios, incluidos
+    los que terminan en 404), así que sin cota la caché crecería sin
+    límite. Al llegar a la cota se purgan primero las entradas expiradas
+    y después las menos usadas recientemente.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, maxsize: int = 1024):
+        """
+        Inicializa la caché.
+
+        Args:
+            ttl_seconds: Tiempo de vida por defecto de cada entrada
+            maxsize: Número máximo de entradas vivas
+        """
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        # dict ordenado por inserción: el orden hace de cola LRU
+        # (los hits reinsertan la clave al final)
+        self._data = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key: str):
+        """
+        Retorna el valor de una clave, o None si no existe o expiró.
+
+        Args:
+            key: Clave a consultar
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            # Tocar la entrada: reinsertarla al final de la cola LRU
+            del self._data[key]
+            self._data[key] = entry
+            return value
+
+    def set(self, key: str, value, ttl_seconds: int = None):
+        """
+        Guarda un valor con expiración (equivalente a SETEX).
+
+        Args:
+            key: Clave a guardar
+            value: Valor asociado
+            ttl_seconds: TTL específico; si se omite se usa el de la caché
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._evict_locked()
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, *keys: str):
+        """
+        Elimina una o varias claves (equivalente a DEL).
+
+        Args:
+            keys: Claves a eliminar
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def _evict_locked(self):
+        """Hace sitio para una entrada nueva (llamar con self._lock tomado).
+
+        Barre primero todas las entradas ya expiradas; si aun así no hay
+        hueco, desaloja las más antiguas de la cola LRU.
+        """
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+
+    @contextmanager
+    def lock_for(self, key: str):
+        """
+        Adquiere un lock por clave para colapsar misses concurrentes
+        (patrón singleflight): sólo un hilo consulta la fuente; el resto
+        espera y encuentra el valor ya cacheado.
+
+        Cada lock lleva un contador de uso y se elimina del registro
+        cuando sale el último hilo, para que las claves sondeadas una
+        sola vez (p. ej. 404s de IDs arbitrarios) no acumulen locks
+        huérfanos de por vida.
+
+        Args:
+            key: Clave cuyo lock se solicita
+        """
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = [threading.Lock(), 0]
+                self._key_locks[key] = entry
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._key_locks.pop(key, None)
@@ -1,78 +1,113 @@
 import logging
+import queue
 import sys
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+
+
+DEFAULT_LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+# ==================== Infraestructura compartida ====================
+
+# Un único par de handlers (archivo + consola) para toda la aplicación,
+# alimentados por una cola: el hilo del QueueListener hace la E/S de
+# app.log fuera del camino de la petición.
+_log_queue = queue.SimpleQueue()
+
+_formatter = logging.Formatter(DEFAULT_LOG_FORMAT)
+
+_file_handler = logging.FileHandler("app.log", encoding="utf-8")
+_file_handler.setFormatter(_formatter)
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_formatter)
+
+_queue_listener = QueueListener(_log_queue, _file_handler, _stream_handler)
+_queue_listener.start()
+
+# Logger padre de los módulos de la app ("app.*"): los hijos propagan
+# hacia él sin handlers propios, evitando handlers de archivo duplicados
+_app_root_logger = logging.getLogger("app")
+_app_root_logger.setLevel(logging.DEBUG)
+_app_root_logger.addHandler(QueueHandler(_log_queue))
+_app_root_logger.propagate = False
 
 
 def setup_logger(
     name: str = "uvicorn.access",
     level: int = logging.DEBUG,
     log_file: str = "app.log",
-    log_format: str = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    log_format: str = DEFAULT_LOG_FORMAT
 ) -> logging.Logger:
     """
-    Configura y retorna un logger con handlers para archivo y consola.
-    
+    Configura y retorna un logger conectado a los handlers compartidos.
+
+    El logger recibe un único QueueHandler; el archivo y la consola los
+    escribe el QueueListener compartido, de modo que configurar varios
+    loggers no abre app.log varias veces.
+
     Args:
         name: Nombre del logger
         level: Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        log_file: Nombre del archivo de log
-        log_format: Formato de los mensajes de log
-        
+        log_file: Mantenido por compatibilidad; la salida va a los
+            handlers compartidos
+        log_format: Mantenido por compatibilidad
+
     Returns:
         logging.Logger: Logger configurado
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Evitar duplicación de handlers
     if logger.hasHandlers():
         logger.handlers.clear()
-    
-    # Formatter
-    formatter = logging.Formatter(log_format)
-    
-    # File Handler
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    
-    # Stream Handler (consola)
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setLevel(level)
-    stream_handler.setFormatter(formatter)
-    
-    # Agregar handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
-    
+
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.propagate = False
+
     return logger
 
 
 def get_logger(name: str) -> logging.Logger:
     """
-    Obtiene un logger por nombre. Si no existe, lo crea con configuración por defecto.
-    
+    Obtiene un logger por nombre delegando en el gestor centralizado.
+
     Args:
         name: Nombre del logger (usualmente __name__ del módulo)
-        
+
     Returns:
         logging.Logger: Logger configurado
     """
-    logger = logging.getLogger(name)
-    
-    # Si el logger no tiene handlers, configurarlo
-    if not logger.hasHandlers():
-        logger.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-        )
-        
-        # Stream Handler
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-    
-    return logger
+    return logger_manager.get_logger(name)
+
+
+class ContextAdapter(logging.LoggerAdapter):
+    """
+    Adapter que adjunta contexto fijo (op, user_id, email...) a cada
+    registro. El sufijo "clave=valor" se construye una sola vez al
+    bindear, no en cada llamada de log.
+    """
+
+    def __init__(self, logger: logging.Logger, context: dict):
+        super().__init__(logger, context)
+        self._suffix = " ".join(f"{key}={value}" for key, value in context.items())
+
+    def process(self, msg, kwargs):
+        return f"{msg} [{self._suffix}]", kwargs
+
+
+def bind(logger: logging.Logger, **context) -> ContextAdapter:
+    """
+    Retorna un adapter con el contexto ligado una vez por operación,
+    para que los mensajes individuales no repitan la interpolación
+    de los mismos campos.
+
+    Args:
+        logger: Logger base al que delegar
+        context: Pares clave=valor que acompañan a cada registro
+    """
+    return ContextAdapter(logger, context)
 
 
 class LoggerManager:
@@ -82,12 +117,12 @@ class LoggerManager:
     """
     _instance = None
     _loggers = {}
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(LoggerManager, cls).__new__(cls)
         return cls._instance
-    
+
     def get_logger(
         self,
         name: str,
@@ -96,27 +131,34 @@ class LoggerManager:
     ) -> logging.Logger:
         """
         Obtiene o crea un logger con configuración específica.
-        
+
+        Los loggers de módulos de la app ("app.*") no reciben handlers
+        propios: propagan hacia el logger padre "app", que alimenta los
+        handlers compartidos.
+
         Args:
             name: Nombre del logger
             level: Nivel de logging
-            log_file: Archivo de log
-            
+            log_file: Archivo de log (compatibilidad)
+
         Returns:
             logging.Logger: Logger configurado
         """
         if name not in self._loggers:
-            self._loggers[name] = setup_logger(
-                name=name,
-                level=level,
-                log_file=log_file
-            )
+            if name == "app" or name.startswith("app."):
+                logger = logging.getLogger(name)
+                logger.setLevel(level)
+                logger.handlers.clear()
+                logger.propagate = True
+            else:
+                logger = setup_logger(name=name, level=level, log_file=log_file)
+            self._loggers[name] = logger
         return self._loggers[name]
-    
+
     def configure_all_loggers(self, level: int):
         """
         Cambia el nivel de logging para todos los loggers existentes.
-        
+
         Args:
             level: Nuevo nivel de logging
         """
@@ -141,7 +183,7 @@ app_logger = setup_logger(
 def log_function_call(func):
     """
     Decorador para loguear llamadas a funciones.
-    
+
     Usage:
         @log_function_call
         def my_function(arg1, arg2):
@@ -163,7 +205,7 @@ def log_function_call(func):
 def log_exception(logger: logging.Logger, exception: Exception, context: str = ""):
     """
     Loguea una excepción con contexto adicional.
-    
+
     Args:
         logger: Logger a utilizar
         exception: Excepción a loguear
@@ -179,7 +221,7 @@ def log_exception(logger: logging.Logger, exception: Exception, context: str = "
 def log_request_response(logger: logging.Logger, method: str, url: str, status_code: int, duration_ms: float):
     """
     Loguea información de request/response HTTP.
-    
+
     Args:
         logger: Logger a utilizar
         method: Método HTTP (GET, POST, etc.)
@@ -188,6 +230,6 @@ def log_request_response(logger: logging.Logger, method: str, url: str, status_c
         duration_ms: Duración del request en milisegundos
     """
     logger.info(
-        f"{method} {url} - Status: {status_code} - Duration: {duration_ms:.2f}ms"
+        "%s %s - Status: %s - Duration: %.2fms",
+        method, url, status_code, duration_ms
     )
-
@@ -0,0 +1,65 @@
+import threading
+
+
+class Counter:
+    """
+    Contador acumulativo en proceso, con o sin etiquetas.
+
+    Equivalente mínimo de prometheus_client.Counter: inc() es un
+    incremento protegido por lock (~ns), muchísimo más barato que emitir
+    una línea de log formateada por operación. Si más adelante se adopta
+    prometheus_client, la API (labels().inc()) es la misma.
+    """
+
+    def __init__(self, name: str, description: str = "", labelnames: tuple = ()):
+        """
+        Inicializa el contador.
+
+        Args:
+            name: Nombre del contador (p. ej. "users_created_total")
+            description: Descripción de qué mide
+            labelnames: Nombres de etiquetas; vacío para contador simple
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues) -> "_Child":
+        """
+        Retorna el contador hijo para una combinación de etiquetas.
+
+        Args:
+            labelvalues: Valores de etiqueta, en el orden de labelnames
+        """
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"El contador {self.name} espera {len(self.labelnames)} etiquetas")
+        return _Child(self, labelvalues)
+
+    def inc(self, amount: int = 1):
+        """Incrementa el contador sin etiquetas."""
+        self._inc((), amount)
+
+    def _inc(self, key: tuple, amount: int):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labelvalues) -> int:
+        """Retorna el valor actual para una combinación de etiquetas."""
+        with self._lock:
+            return self._values.get(tuple(labelvalues), 0)
+
+
+class _Child:
+    """Vista de un Counter ligada a una combinación concreta de etiquetas."""
+
+    __slots__ = ('_counter', '_key')
+
+    def __init__(self, counter: Counter, labelvalues: tuple):
+        self._counter = counter
+        self._key = tuple(labelvalues)
+
+    def inc(self, amount: int = 1):
+        """Incrementa el contador para estas etiquetas."""
+        self._counter._inc(self._key, amount)
@@ -1,3 +1,6 @@
+import json
+import re
+from functools import lru_cache
 from typing import Optional, List
 
 from app.models.domain import User, UserStatus
@@ -6,14 +9,76 @@ from app.models.exception import (
     UserNotFoundException,
     DuplicateEmailException,
     InvalidAgeException,
-    InvalidUserNameException,
-    AppBaseException
+    InvalidUserNameException
 )
-from app.services.logger import get_logger, log_exception
+from app.core.config import settings
+from app.services.cache import TTLCache
+from app.services.logger import get_logger, log_exception, bind
+from app.services.metrics import Counter
 
 logger = get_logger(__name__)
 
 
+# Edad mínima congelada a nivel de módulo para que el chequeo compilado
+# no dependa del objeto settings
+_MIN_USER_AGE = settings.MIN_USER_AGE
+
+try:
+    # numba es opcional: si está instalado, el chequeo de edad se compila
+    # una vez a código nativo (la firma explícita evita la latencia de la
+    # primera llamada). El raise y el logging quedan en Python.
+    from numba import njit
+
+    @njit('boolean(int64)', cache=True)
+    def _age_ok(age):
+        return age >= _MIN_USER_AGE
+except ImportError:
+    def _age_ok(age: int) -> bool:
+        return age >= _MIN_USER_AGE
+
+
+# Validaciones puras memoizadas: los mismos valores se repiten mucho
+# (edades 18-99, nombres comunes), así que las llamadas repetidas se
+# resuelven con un lookup de diccionario. El logging y el raise quedan
+# fuera para que el camino cacheado no construya nada.
+
+@lru_cache(maxsize=2048)
+def _validate_age_cached(age: int) -> bool:
+    """Retorna True si la edad cumple el mínimo configurado."""
+    return _age_ok(age)
+
+
+# Escaneo compilado que corta en el primer carácter no-espacio, sin
+# construir la cadena intermedia que name.strip() sí construye
+_HAS_NONSPACE = re.compile(r'\S').search
+
+
+@lru_cache(maxsize=2048)
+def _validate_name_cached(name: str) -> bool:
+    """Retorna True si el nombre no está vacío ni es sólo espacios."""
+    return bool(name) and _HAS_NONSPACE(name) is not None
+
+
+# Mensajes de validación estáticos (el formateo sí se hace una sola
+# vez). La excepción en cambio se construye en cada raise: reutilizar
+# una instancia compartida mutaría __traceback__/__context__ entre
+# hilos concurrentes y retendría los frames del último raise (y sus
+# locals) durante toda la vida del proceso.
+_MSG_AGE = "La edad debe ser mayor o igual a 18 años"
+_MSG_NAME = "El nombre no puede estar vacío o solo contener espacios"
+
+# Miembro resuelto una vez para el camino rápido de creación: evita el
+# lookup UserStatus.ACTIVE por llamada
+_ACTIVE = UserStatus.ACTIVE
+
+# Observabilidad del camino caliente: contadores atómicos en lugar de
+# una línea INFO formateada por operación; el log de éxito de creación
+# se muestrea 1 de cada _CREATE_LOG_SAMPLE
+USERS_CREATED = Counter("users_created_total", "Usuarios creados exitosamente")
+USER_LOOKUPS = Counter("user_lookups_total", "Búsquedas de usuario", ("op", "result"))
+_CREATE_LOG_SAMPLE = 1000
+
+
 class UserService:
     """
     Servicio de negocio para gestión de usuarios.
@@ -28,6 +93,12 @@ class UserService:
             user_repository: Implementación del repositorio de usuarios
         """
         self.user_repository = user_repository
+        # Caché de lectura (read-through) para las búsquedas calientes;
+        # se invalida en update_user_status para no servir datos viejos
+        self._cache = TTLCache(
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            maxsize=settings.CACHE_MAX_ENTRIES
+        )
         logger.info("UserService inicializado correctamente")
 
     def create_user(self, email: str, name: str, age: int, status: UserStatus = UserStatus.ACTIVE) -> User:
@@ -48,9 +119,17 @@ class UserService:
             InvalidUserNameException: Si el nombre está vacío o solo contiene espacios
             DuplicateEmailException: Si el email ya existe en la base de datos
         """
+        # Despachar al camino especializado para el caso abrumadoramente
+        # común (registro de usuarios activos)
+        if status is _ACTIVE:
+            return self._create_user_active(email, name, age)
+
+        # Contexto ligado una vez por operación: los mensajes no repiten
+        # la interpolación del email en cada llamada
+        log = bind(logger, op="create_user", email=email)
         try:
-            logger.info(f"Intentando crear usuario con email: {email}")
-            
+            log.debug("Intentando crear usuario")
+
             # Crear objeto User
             new_user = User(
                 email=email,
@@ -58,19 +137,109 @@ class UserService:
                 age=age,
                 status=status
             )
-            
+
             # Guardar en el repositorio
             saved_user = self.user_repository.save(new_user)
-            
-            logger.info(f"Usuario creado exitosamente con ID: {saved_user.id}")
+
+            # El email ahora existe con certeza: fijarlo en la caché de
+            # existencia con TTL largo para que los chequeos posteriores
+            # no toquen la base de datos
+            self._cache.set(f"exists:email:{email}", True, ttl_seconds=3600)
+
+            USERS_CREATED.inc()
+            log.debug("Usuario creado con ID: %s", saved_user.id)
+            if saved_user.id is not None and saved_user.id % _CREATE_LOG_SAMPLE == 0:
+                log.info("%s usuarios creados hasta ahora", saved_user.id)
             return saved_user
-            
+
+        except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException) as e:
+            log.error("Error de validación al crear usuario: %s", e)
+            raise
+
+    def _create_user_active(self, email: str, name: str, age: int) -> User:
+        """Camino rápido de create_user especializado en status ACTIVE.
+
+        Mismo cuerpo que el camino genérico pero con el estado fijado al
+        miembro _ACTIVE ya resuelto a nivel de módulo: sin parámetro
+        status que ligar ni lookup de enum por llamada.
+        """
+        log = bind(logger, op="create_user", email=email)
+        try:
+            log.debug("Intentando crear usuario")
+
+            new_user = User(
+                email=email,
+                name=name,
+                age=age,
+                status=_ACTIVE
+            )
+
+            saved_user = self.user_repository.save(new_user)
+
+            # El email ahora existe con certeza: fijarlo en la caché de
+            # existencia con TTL largo
+            self._cache.set(f"exists:email:{email}", True, ttl_seconds=3600)
+
+            USERS_CREATED.inc()
+            log.debug("Usuario creado con ID: %s", saved_user.id)
+            if saved_user.id is not None and saved_user.id % _CREATE_LOG_SAMPLE == 0:
+                log.info("%s usuarios creados hasta ahora", saved_user.id)
+            return saved_user
+
+        except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException) as e:
+            log.error("Error de validación al crear usuario: %s", e)
+            raise
+
+    def create_users_bulk(self, users_data: List[dict]) -> List[User]:
+        """
+        Crea varios usuarios en una sola transacción.
+
+        Args:
+            users_data: Lista de dicts con email, name, age y status opcional
+
+        Returns:
+            List[User]: Usuarios creados con ID asignado
+
+        Raises:
+            InvalidAgeException: Si alguna edad es menor a 18 años
+            InvalidUserNameException: Si algún nombre está vacío
+            DuplicateEmailException: Si algún email ya existe o se repite en el lote
+        """
+        log = bind(logger, op="create_users_bulk", count=len(users_data))
+        try:
+            log.info("Intentando crear lote de usuarios")
+
+            # Lote vacío: respuesta vacía sin tocar el repositorio
+            if not users_data:
+                return []
+
+            new_users = [
+                User(
+                    email=data['email'],
+                    name=data['name'],
+                    age=data['age'],
+                    status=data.get('status', UserStatus.ACTIVE)
+                )
+                for data in users_data
+            ]
+
+            saved_users = self.user_repository.save_many(new_users)
+
+            # Los usuarios creados por lote también cuentan en el total
+            USERS_CREATED.inc(len(saved_users))
+
+            # Mantener la caché de existencia igual que en create_user:
+            # sin esto, un negativo cacheado seguiría reportando como
+            # disponible un email recién creado por lote
+            for user in saved_users:
+                self._cache.set(f"exists:email:{user.email}", True, ttl_seconds=3600)
+
+            log.info("Lote de usuarios creado exitosamente")
+            return saved_users
+
         except (InvalidAgeException, InvalidUserNameException, DuplicateEmailException) as e:
-            logger.error(f"Error de validación al crear usuario: {str(e)}")
+            log.error("Error de validación al crear lote de usuarios: %s", e)
             raise
-        except Exception as e:
-            logger.error(f"Error inesperado al crear usuario: {str(e)}")
-            raise AppBaseException(f"Error al crear usuario: {str(e)}")
 
     def get_user_by_id(self, user_id: int) -> User:
         """
@@ -85,18 +254,37 @@ class UserService:
         Raises:
             UserNotFoundException: Si el usuario no existe
         """
+        log = bind(logger, op="get_user_by_id", user_id=user_id)
         try:
-            logger.info(f"Buscando usuario con ID: {user_id}")
-            user = self.user_repository.find_by_id(user_id)
-            logger.info(f"Usuario encontrado: {user.email}")
+            log.debug("Buscando usuario")
+
+            cache_key = f"user:id:{user_id}"
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                USER_LOOKUPS.labels("by_id", "cache_hit").inc()
+                log.debug("Usuario servido desde caché de servicio")
+                return cached
+
+            # Singleflight: misses concurrentes del mismo ID colapsan en
+            # una sola consulta al repositorio
+            with self._cache.lock_for(cache_key):
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    USER_LOOKUPS.labels("by_id", "cache_hit").inc()
+                    return cached
+                user = self.user_repository.find_by_id(user_id)
+                self._cache.set(cache_key, user)
+
+            # Etiqueta distinta para el hit resuelto en la base de datos:
+            # cache_hit/db_hit permiten medir la efectividad de la caché
+            USER_LOOKUPS.labels("by_id", "db_hit").inc()
+            log.debug("Usuario encontrado: %s", user.email)
             return user
-            
-        except UserNotFoundException as e:
-            logger.error(f"Usuario con ID {user_id} no encontrado")
+
+        except UserNotFoundException:
+            USER_LOOKUPS.labels("by_id", "miss").inc()
+            log.error("Usuario no encontrado")
             raise
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar usuario por ID: {str(e)}")
-            raise AppBaseException(f"Error al buscar usuario: {str(e)}")
 
     def get_user_by_email(self, email: str) -> dict:
         """
@@ -111,23 +299,35 @@ class UserService:
         Raises:
             UserNotFoundException: Si el usuario no existe
         """
+        log = bind(logger, op="get_user_by_email", email=email)
         try:
-            logger.info(f"Buscando usuario con email: {email}")
-            user_dict = self.user_repository.get_user_by_email(email)
-            
-            if 'error' in user_dict:
-                logger.error(f"Error al buscar usuario por email: {user_dict['error']}")
-                raise UserNotFoundException(user_dict['error'])
-            
-            logger.info(f"Usuario encontrado con email: {email}")
+            log.debug("Buscando usuario")
+
+            cache_key = f"user:email:{email}"
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                USER_LOOKUPS.labels("by_email", "cache_hit").inc()
+                log.debug("Usuario servido desde caché de servicio")
+                return cached
+
+            with self._cache.lock_for(cache_key):
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    USER_LOOKUPS.labels("by_email", "cache_hit").inc()
+                    return cached
+                # El repositorio lanza UserNotFoundException en el miss;
+                # aquí sólo se cachea el hit
+                user_dict = self.user_repository.get_user_by_email(email)
+                self._cache.set(cache_key, user_dict)
+
+            USER_LOOKUPS.labels("by_email", "db_hit").inc()
+            log.debug("Usuario encontrado")
             return user_dict
-            
-        except UserNotFoundException as e:
-            logger.error(f"Usuario con email {email} no encontrado")
+
+        except UserNotFoundException:
+            USER_LOOKUPS.labels("by_email", "miss").inc()
+            log.error("Usuario no encontrado")
             raise
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar usuario por email: {str(e)}")
-            raise AppBaseException(f"Error al buscar usuario: {str(e)}")
 
     def validate_user_age(self, age: int) -> bool:
         """
@@ -142,9 +342,9 @@ class UserService:
         Raises:
             InvalidAgeException: Si la edad es menor a 18 años
         """
-        if age < 18:
-            logger.warning(f"Edad inválida proporcionada: {age}")
-            raise InvalidAgeException("La edad debe ser mayor o igual a 18 años")
+        if not _validate_age_cached(age):
+            logger.warning("Edad inválida proporcionada: %s", age)
+            raise InvalidAgeException(_MSG_AGE)
         return True
 
     def validate_user_name(self, name: str) -> bool:
@@ -160,9 +360,9 @@ class UserService:
         Raises:
             InvalidUserNameException: Si el nombre está vacío o solo contiene espacios
         """
-        if not name or not name.strip():
+        if not _validate_name_cached(name):
             logger.warning("Nombre de usuario inválido proporcionado")
-            raise InvalidUserNameException("El nombre no puede estar vacío o solo contener espacios")
+            raise InvalidUserNameException(_MSG_NAME)
         return True
 
     def email_exists(self, email: str) -> bool:
@@ -175,14 +375,26 @@ class UserService:
         Returns:
             bool: True si el email existe, False en caso contrario
         """
-        try:
-            logger.info(f"Verificando existencia de email: {email}")
-            exists = self.user_repository.email_exists(email)
-            logger.info(f"Email {email} existe: {exists}")
-            return exists
-        except Exception as e:
-            logger.error(f"Error al verificar email: {str(e)}")
-            raise AppBaseException(f"Error al verificar email: {str(e)}")
+        logger.debug("Verificando existencia de email: %s", email)
+
+        # Los flujos de registro sondean el mismo email varias veces
+        # (check → submit → reintento), así que el resultado se cachea
+        # con TTL corto; los negativos expiran antes para no retrasar
+        # un registro recién hecho y mitigar sondeos de enumeración.
+        # La clave usa el email tal cual: la BD compara con colación
+        # sensible a mayúsculas, así que normalizar aquí haría que las
+        # variantes de capitalización se contaminaran entre sí
+        cache_key = f"exists:email:{email}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Existencia de email %s servida desde caché", email)
+            return cached
+
+        exists = self.user_repository.email_exists(email)
+        self._cache.set(cache_key, exists, ttl_seconds=60 if exists else 10)
+
+        logger.debug("Email %s existe: %s", email, exists)
+        return exists
 
     def update_user_status(self, user_id: int, new_status: UserStatus) -> User:
         """
@@ -198,51 +410,78 @@ class UserService:
         Raises:
             UserNotFoundException: Si el usuario no existe
         """
-        try:
-            logger.info(f"Actualizando estado del usuario {user_id} a {new_status.value}")
-            
-            # Obtener usuario existente
-            user = self.get_user_by_id(user_id)
-            
-            # Actualizar estado
-            user.status = new_status
-            
-            # Guardar cambios (en un escenario real, necesitarías un método update en el repositorio)
-            # Por ahora, esto es conceptual ya que el repositorio solo tiene save
-            logger.info(f"Estado del usuario {user_id} actualizado exitosamente")
-            return user
-            
-        except UserNotFoundException:
-            raise
-        except Exception as e:
-            logger.error(f"Error al actualizar estado del usuario: {str(e)}")
-            raise AppBaseException(f"Error al actualizar usuario: {str(e)}")
+        log = bind(logger, op="update_user_status", user_id=user_id)
+        log.info("Actualizando estado a %s", new_status.value)
+
+        # Un único UPDATE ... RETURNING: sin SELECT previo ni ventana
+        # entre leer y escribir
+        user = self.user_repository.update_status(user_id, new_status)
+        if user is None:
+            raise UserNotFoundException(f"Usuario con ID '{user_id}' no encontrado")
+
+        # Invalidar la caché de lecturas para no servir el estado viejo
+        self._cache.delete(f"user:id:{user_id}", f"user:email:{user.email}")
+
+        log.info("Estado actualizado exitosamente")
+        return user
 
-    def get_user_info(self, user_id: int) -> dict:
+    def get_user_info(self, user_id: int) -> str:
         """
-        Obtiene información completa del usuario en formato dict.
-        
+        Obtiene información completa del usuario como JSON ya serializado.
+
+        El esquema es fijo, así que el JSON se emite con una plantilla
+        f-string: json.dumps sólo escapa los campos de texto (email,
+        name); id y age son enteros y status es un valor de enum conocido
+        y seguro. El llamador devuelve la cadena tal cual sin que el
+        framework vuelva a serializarla.
+
         Args:
             user_id: ID del usuario
-            
+
         Returns:
-            dict: Información del usuario
-            
+            str: Información del usuario como documento JSON
+
         Raises:
             UserNotFoundException: Si el usuario no existe
         """
-        try:
-            logger.info(f"Obteniendo información del usuario {user_id}")
-            user = self.get_user_by_id(user_id)
-            return {
-                "id": user.id,
-                "email": user.email,
-                "name": user.name,
-                "age": user.age,
-                "status": user.status.value
-            }
-        except UserNotFoundException:
-            raise
-        except Exception as e:
-            logger.error(f"Error al obtener información del usuario: {str(e)}")
-            raise AppBaseException(f"Error al obtener información del usuario: {str(e)}")
+        logger.debug("Obteniendo información del usuario %s", user_id)
+        # El repositorio entrega la fila como dict directamente, sin
+        # pasar por un User intermedio que habría que desarmar aquí
+        row = self.user_repository.find_by_id_as_dict(user_id)
+        return (
+            f'{{"id":{row["id"]},'
+            f'"email":{json.dumps(row["email"])},'
+            f'"name":{json.dumps(row["name"])},'
+            f'"age":{row["age"]},'
+            f'"status":"{row["status"]}"}}'
+        )
+
+    def get_users_info_bulk(self, user_ids: List[int]) -> dict:
+        """
+        Obtiene información de varios usuarios en formato columnar.
+
+        Una sola consulta para todo el lote y un dict de listas paralelas
+        ({'id': [...], 'email': [...], ...}) en lugar de N dicts: más
+        compacto de serializar y sin objetos User intermedios. Los IDs
+        que no existen simplemente no aparecen.
+
+        Args:
+            user_ids: IDs de los usuarios a consultar
+
+        Returns:
+            dict: Columnas id, email, name, age y status como listas
+        """
+        logger.debug("Obteniendo información de %s usuarios", len(user_ids))
+
+        rows = self.user_repository.find_by_ids(user_ids)
+
+        columns = {'id': [], 'email': [], 'name': [], 'age': [], 'status': []}
+        for row in rows:
+            columns['id'].append(row['id'])
+            columns['email'].append(row['email'])
+            columns['name'].append(row['name'])
+            columns['age'].append(row['age'])
+            columns['status'].append(row['status'].value)
+
+        logger.debug("Recuperados %s de %s usuarios solicitados", len(columns['id']), len(user_ids))
+        return columns